@@ -1,6 +1,11 @@
-from typing import List, Optional, Callable
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Callable
 
-import magic
+from .header_sniff import CFBF_SIG, sniff_mime
+
+if TYPE_CHECKING:
+    from .mime_cache import MimeCache
 
 # Supported MIME types for filtering
 DOC_MIME_TYPES: List[str] = [
@@ -30,40 +35,212 @@ ZIP_MIME_TYPES: List[str] = [
     "application/x-compress",
 ]
 
-KIND_MIME_MAP: dict = {
-    "doc": DOC_MIME_TYPES,
-    "xls": XLS_MIME_TYPES,
-    "ppt": PPT_MIME_TYPES,
-    "zip": ZIP_MIME_TYPES,
+# MIME types per kind, as frozensets for constant-time membership tests
+KIND_MIME_MAP: Dict[str, FrozenSet[str]] = {
+    "doc": frozenset(DOC_MIME_TYPES),
+    "xls": frozenset(XLS_MIME_TYPES),
+    "ppt": frozenset(PPT_MIME_TYPES),
+    "zip": frozenset(ZIP_MIME_TYPES),
     # Add more kinds and corresponding MIME lists if needed
 }
 
+# MIME types implied by well-known file extensions (lower-case, with leading dot).
+# Used to skip libmagic for files whose extension already tells the kind.
+EXT_MIME_MAP: Dict[str, str] = {
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".odt": "application/vnd.oasis.opendocument.text",
+    ".xls": "application/vnd.ms-excel",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".ods": "application/vnd.oasis.opendocument.spreadsheet",
+    ".ppt": "application/vnd.ms-powerpoint",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ".odp": "application/vnd.oasis.opendocument.presentation",
+    ".zip": "application/zip",
+    ".tar": "application/x-tar",
+    ".bz2": "application/x-bzip2",
+    ".tbz2": "application/x-bzip2",
+    ".gz": "application/gzip",
+    ".tgz": "application/gzip",
+    ".7z": "application/x-7z-compressed",
+    ".rar": "application/x-rar-compressed",
+    ".xz": "application/x-xz",
+    ".txz": "application/x-xz",
+    ".lzma": "application/x-lzma",
+    ".z": "application/x-compress",
+}
+
+# Well-known extensions of each kind, and of all kinds together
+KIND_EXTS: Dict[str, FrozenSet[str]] = {
+    kind: frozenset(ext for ext, mime in EXT_MIME_MAP.items() if mime in mimes) for kind, mimes in KIND_MIME_MAP.items()
+}
+ALL_KIND_EXTS: FrozenSet[str] = frozenset(EXT_MIME_MAP)
+
+
+# Environment variable selecting the MIME detection backend
+MIME_BACKEND_ENV = "LATEST_MIME_BACKEND"
+
+# Bytes read from the start of a file for libmagic. Enough for the header-based tests of
+# common formats (including the zip entry names that identify OOXML), while bounding the
+# per-file read regardless of file size.
+MAGIC_BUFFER_SIZE = 64 * 1024
+
+# A MIME detector takes (path, mtime_ns, size); mtime_ns and size come from the caller's stat
+MimeDetector = Callable[[str, int, int], Optional[str]]
+
+
+def _libmagic_detector() -> MimeDetector:
+    # Imported here so that runs without --kind (and the header backend) never load libmagic
+    import magic
+
+    # Keep one libmagic handle per thread instead of reloading the magic DB per file.
+    # (A shared handle would serialize the checks, as python-magic locks each call.)
+    local = threading.local()
+
+    # The cache is opened (and created if missing) only once a file actually needs detection,
+    # so runs decided entirely by file extensions never touch it
+    cache_lock = threading.Lock()
+    cache_state: Dict[str, Any] = {}
+
+    def get_cache() -> Optional["MimeCache"]:
+        with cache_lock:
+            if "cache" not in cache_state:
+                from .mime_cache import open_mime_cache
+
+                cache_state["cache"] = open_mime_cache()
+            return cache_state["cache"]
+
+    def from_file(path: str) -> str:
+        m = getattr(local, "magic", None)
+        if m is None:
+            m = local.magic = magic.Magic(mime=True)
+        with open(path, "rb") as fh:
+            head = fh.read(MAGIC_BUFFER_SIZE)
+        # libmagic needs random access to a CFBF file's directory to tell legacy Office
+        # formats apart, which a prefix does not give it
+        if head.startswith(CFBF_SIG):
+            return m.from_file(path)
+        mime = m.from_buffer(head)
+        if mime == "application/CDFV2":
+            return m.from_file(path)
+        return mime
+
+    def detect_mime(path: str, mtime_ns: int, size: int) -> Optional[str]:
+        cache = get_cache()
+        if cache is None:
+            return from_file(path)
+        mime = cache.get(path, mtime_ns, size)
+        if mime is None:
+            mime = from_file(path)
+            cache.put(path, mtime_ns, size, mime)
+        return mime
+
+    return detect_mime
+
+
+def _puremagic_detector() -> Optional[MimeDetector]:
+    try:
+        import puremagic
+    except ImportError:
+        return None
+
+    def detect_mime(path: str, mtime_ns: int, size: int) -> Optional[str]:
+        try:
+            return puremagic.from_file(path, mime=True) or "application/octet-stream"
+        except puremagic.PureError:
+            return "application/octet-stream"
+
+    return detect_mime
+
+
+def get_mime_detector(kind: str) -> MimeDetector:
+    """
+    Return the MIME detection function selected by $LATEST_MIME_BACKEND.
+
+    "magic" (default) uses libmagic, "puremagic" uses the puremagic package if installed,
+    and "header" sniffs the fixed signatures of the doc/xls/ppt/zip kinds. Backends that
+    are unavailable, or cannot tell the given kind, fall back to libmagic.
+
+    Args:
+        kind (str): Lower-case kind keyword.
+    Returns:
+        MimeDetector: Function that accepts a file path, mtime (ns) and size, and returns its MIME type
+        (None if the header backend does not recognize the format).
+    """
+    backend = os.environ.get(MIME_BACKEND_ENV, "magic").lower()
+    if backend == "header" and kind in KIND_MIME_MAP:
+        # The header sniffer recognizes every MIME type of these kinds
+        return lambda path, mtime_ns, size: sniff_mime(path)
+    if backend == "puremagic":
+        detector = _puremagic_detector()
+        if detector is not None:
+            return detector
+    return _libmagic_detector()
+
+
+def get_ext_prefilter(kind: Optional[str]) -> Callable[[str], Optional[bool]]:
+    """
+    Return a function that decides from the file extension alone whether a file matches the kind.
+
+    For the doc/xls/ppt/zip kinds, a well-known extension of the kind means a match and one of
+    another kind means no match; any other extension (and any other kind) is undecided.
+
+    Args:
+        kind (Optional[str]): Kind keyword (e.g. "doc", "xls", etc.)
+    Returns:
+        Callable[[str], Optional[bool]]: Function that accepts a file path and returns True/False,
+        or None if the MIME type has to be detected.
+    """
+    kind = (kind or "").lower()
+    if kind not in KIND_MIME_MAP:
+        return lambda path: None
+    own_exts = KIND_EXTS[kind]
+    other_exts = ALL_KIND_EXTS - own_exts
+
+    def prefilter(path: str) -> Optional[bool]:
+        ext = os.path.splitext(path)[1].lower()
+        if ext in own_exts:
+            return True
+        if ext in other_exts:
+            return False
+        return None
+
+    return prefilter
+
 
-def get_kind_checker(kind: Optional[str]) -> Callable[[str], bool]:
+def get_kind_checker(kind: Optional[str]) -> Callable[[str, int, int], bool]:
     """
     Return a function to check if a file matches the given kind (by MIME type).
 
     Args:
         kind (Optional[str]): Kind keyword (e.g. "doc", "xls", etc.)
     Returns:
-        Callable[[str], bool]: Function that accepts a file path and returns True if it matches.
+        Callable[[str, int, int], bool]: Function that accepts a file path with its
+        already-known mtime (ns) and size, and returns True if it matches.
     """
     if not kind:
         # No kind specified: always return True
-        return lambda x: True
+        return lambda path, mtime_ns, size: True
     kind = kind.lower()
+    detect_mime = get_mime_detector(kind)
     if kind in KIND_MIME_MAP:
         targets = KIND_MIME_MAP[kind]
+        prefilter = get_ext_prefilter(kind)
 
-        def checker(path: str) -> bool:
-            mime = magic.from_file(path, mime=True)
+        def checker(path: str, mtime_ns: int, size: int) -> bool:
+            # A well-known extension, of this kind or of another one, is conclusive;
+            # only files with other extensions need their MIME type detected
+            verdict = prefilter(path)
+            if verdict is not None:
+                return verdict
+            mime = detect_mime(path, mtime_ns, size)
             return mime in targets
 
         return checker
 
     # Fallback: check if the major MIME type matches the kind
-    def checker(path: str) -> bool:
-        mime = magic.from_file(path, mime=True)
+    def checker(path: str, mtime_ns: int, size: int) -> bool:
+        mime = detect_mime(path, mtime_ns, size) or ""
         return mime.split("/")[0] == kind
 
     return checker
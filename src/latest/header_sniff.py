@@ -0,0 +1,141 @@
+"""
+Header-only MIME detection for the document and archive kinds.
+
+Only the formats listed in file_types' DOC/XLS/PPT/ZIP MIME type lists are
+recognized, by their fixed signatures; everything else yields None.
+"""
+
+import struct
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+HEAD_SIZE = 512
+
+ZIP_SIG = b"PK\x03\x04"
+CFBF_SIG = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# The end-of-central-directory record is within the last 64 KiB (+ its own 22 bytes)
+_EOCD_SEARCH = 65536 + 22
+_CD_READ_LIMIT = 1 << 20
+_CFBF_DIR_READ = 4096
+# CFBF versions 3 and 4 use 512- and 4096-byte sectors
+_CFBF_SECTOR_SHIFTS = (9, 12)
+
+ZIP_MIME = "application/zip"
+CFBF_MIME = "application/x-ole-storage"
+
+# (signature, MIME type) for formats identified by a prefix at offset 0.
+# Zip and CFBF containers are refined further into the Office/ODF types.
+SIGNATURES: List[Tuple[bytes, str]] = [
+    (ZIP_SIG, ZIP_MIME),
+    (CFBF_SIG, CFBF_MIME),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"BZh", "application/x-bzip2"),
+    (b"\xfd7zXZ\x00", "application/x-xz"),
+    (b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (b"Rar!\x1a\x07", "application/x-rar-compressed"),
+    (b"\x5d\x00\x00", "application/x-lzma"),
+    (b"\x1f\x9d", "application/x-compress"),
+]
+
+
+def _build_signature_tables() -> List[Tuple[int, int, Dict[int, str]]]:
+    # Group signatures by length into (length, mask, {value: mime}) over the first 8 bytes read
+    # as a little-endian integer, longest first, so a lookup is one mask and one dict probe per length
+    tables: Dict[int, Dict[int, str]] = {}
+    for sig, mime in SIGNATURES:
+        tables.setdefault(len(sig), {})[int.from_bytes(sig, "little")] = mime
+    return [(n, (1 << (8 * n)) - 1, tables[n]) for n in sorted(tables, reverse=True)]
+
+
+_SIGNATURE_TABLES = _build_signature_tables()
+
+
+def _match_signature(head: bytes) -> Optional[str]:
+    value = int.from_bytes(head[:8], "little")
+    for length, mask, table in _SIGNATURE_TABLES:
+        if len(head) >= length:
+            mime = table.get(value & mask)
+            if mime is not None:
+                return mime
+    return None
+
+
+# Main part of each OOXML document type, as it appears in the zip directory
+OOXML_PARTS: List[Tuple[bytes, str]] = [
+    (b"word/document", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    (b"xl/workbook", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    (b"ppt/presentation", "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+]
+
+# Main stream of each legacy Office document type, as a CFBF directory entry name
+CFBF_STREAMS: List[Tuple[bytes, str]] = [
+    ("WordDocument".encode("utf-16-le"), "application/msword"),
+    ("Workbook".encode("utf-16-le"), "application/vnd.ms-excel"),
+    ("Book".encode("utf-16-le"), "application/vnd.ms-excel"),
+    ("PowerPoint Document".encode("utf-16-le"), "application/vnd.ms-powerpoint"),
+]
+
+
+def _sniff_zip(fh: BinaryIO, head: bytes) -> str:
+    # ODF stores its MIME type uncompressed as the first entry, named "mimetype"
+    if head[30:38] == b"mimetype" and head[8:10] == b"\x00\x00":
+        size = struct.unpack_from("<I", head, 22)[0]
+        mime = head[38 : 38 + size]
+        if mime.startswith(b"application/"):
+            return mime.decode("ascii", "replace")
+
+    # OOXML: look for the main part name in the central directory
+    fh.seek(0, 2)
+    file_size = fh.tell()
+    tail_len = min(file_size, _EOCD_SEARCH)
+    fh.seek(file_size - tail_len)
+    names = fh.read(tail_len)
+    pos = names.rfind(b"PK\x05\x06")
+    if pos >= 0 and pos + 22 <= len(names):
+        cd_size, cd_offset = struct.unpack_from("<II", names, pos + 12)
+        fh.seek(cd_offset)
+        names = fh.read(min(cd_size, _CD_READ_LIMIT))
+    if b"[Content_Types].xml" in names:
+        for part, mime in OOXML_PARTS:
+            if part in names:
+                return mime
+    return ZIP_MIME
+
+
+def _sniff_cfbf(fh: BinaryIO, head: bytes) -> str:
+    # Header fields are untrusted: a corrupt or truncated file is just an unidentified CFBF
+    try:
+        sector_shift = struct.unpack_from("<H", head, 0x1E)[0]
+        dir_sector = struct.unpack_from("<I", head, 0x30)[0]
+        if sector_shift not in _CFBF_SECTOR_SHIFTS:
+            return CFBF_MIME
+        fh.seek((dir_sector + 1) << sector_shift)
+        entries = fh.read(_CFBF_DIR_READ)
+    except (OSError, ValueError, OverflowError, struct.error):
+        return CFBF_MIME
+    for name, mime in CFBF_STREAMS:
+        if name in entries:
+            return mime
+    return CFBF_MIME
+
+
+def sniff_mime(path: str) -> Optional[str]:
+    """
+    Detect the MIME type of a file from its header bytes.
+
+    Args:
+        path (str): File path.
+    Returns:
+        Optional[str]: MIME type, or None if the format is not recognized.
+    """
+    with open(path, "rb") as fh:
+        head = fh.read(HEAD_SIZE)
+        mime = _match_signature(head)
+        if mime == ZIP_MIME:
+            return _sniff_zip(fh, head)
+        if mime == CFBF_MIME and len(head) >= 0x34:
+            return _sniff_cfbf(fh, head)
+
+    if mime is None and head[257:262] == b"ustar":
+        return "application/x-tar"
+    return mime
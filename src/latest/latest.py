@@ -9,9 +9,15 @@ Supports glob patterns, range slicing (Python slice syntax), and file type filte
 import sys
 import os
 import argparse
-from typing import List, Tuple, Dict
+import fnmatch
+import glob
+import heapq
+import re
+from stat import S_ISREG
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple, Dict, Union
 
-from .file_types import get_kind_checker
+from .file_types import get_ext_prefilter, get_kind_checker
 
 try:
     from .__about__ import __version__
@@ -19,47 +25,305 @@ except Exception:
     __version__ = "(unknown)"
 
 
-def resolve_files(patterns: List[str]) -> Tuple[List[str], Dict[str, str]]:
+# Characters that make a path component a wildcard (same set as the glob module)
+_MAGIC_CHECK = re.compile(r"[*?[]")
+
+
+def _join(dirpath: str, name: str) -> str:
+    # An empty dirpath stands for the current directory, as in glob's results
+    return os.path.join(dirpath, name) if dirpath else name
+
+
+def _entry_file_stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    # is_file() uses the file type from the directory listing, so stat() is the only
+    # syscall spent on a regular file (and its result is cached in the entry)
+    try:
+        return entry.stat() if entry.is_file() else None
+    except OSError:
+        return None
+
+
+def _entry_is_dir(entry: os.DirEntry) -> bool:
+    # Like glob, treat an entry whose type cannot be determined (e.g. a symlink loop) as not a directory
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _path_file_stat(path: str) -> Optional[os.stat_result]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if S_ISREG(st.st_mode) else None
+
+
+def _walk_files(dirpath: str) -> Iterator[Tuple[str, os.stat_result]]:
+    # Every non-hidden file below dirpath
+    try:
+        with os.scandir(dirpath or os.curdir) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        st = _entry_file_stat(entry)
+        if st is not None:
+            yield _join(dirpath, entry.name), st
+        elif _entry_is_dir(entry):
+            yield from _walk_files(_join(dirpath, entry.name))
+
+
+def _walk_dirs(dirpath: str) -> Iterator[str]:
+    # dirpath and every non-hidden directory below it
+    yield dirpath
+    try:
+        with os.scandir(dirpath or os.curdir) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        if not entry.name.startswith(".") and _entry_is_dir(entry):
+            yield from _walk_dirs(_join(dirpath, entry.name))
+
+
+# A pattern component with its name matcher (None for "**" and literal components)
+_Part = Tuple[str, Optional[Callable[[str], object]]]
+
+
+def _compile_part(part: str) -> _Part:
+    if part == "**" or not _MAGIC_CHECK.search(part):
+        return part, None
+    # Like fnmatch (and so glob), compare normcase()d names: case-insensitive on Windows
+    pat = os.path.normcase(part)
+    match: Callable[[str], object]
+    if pat.startswith("*") and not _MAGIC_CHECK.search(pat[1:]):
+        # "*.ext", the usual leaf, is a plain suffix test
+        suffix = pat[1:]
+        match = lambda name: name.endswith(suffix)
+    else:
+        match = re.compile(fnmatch.translate(pat)).match
+    if os.name == "nt":
+        case_sensitive_match = match
+        match = lambda name: case_sensitive_match(os.path.normcase(name))
+    return part, match
+
+
+def _walk_glob(dirpath: str, parts: List[_Part]) -> Iterator[Tuple[str, os.stat_result]]:
+    (part, match), rest = parts[0], parts[1:]
+
+    if part == "**":
+        # "**" matches zero or more directory levels
+        if not rest:
+            yield from _walk_files(dirpath)
+        else:
+            for d in _walk_dirs(dirpath):
+                yield from _walk_glob(d, rest)
+        return
+
+    if match is None:
+        # Literal component: no need to list the directory
+        path = _join(dirpath, part)
+        if not rest:
+            st = _path_file_stat(path) if part else None
+            if st is not None:
+                yield path, st
+        elif os.path.isdir(path):
+            yield from _walk_glob(path, rest)
+        return
+
+    try:
+        with os.scandir(dirpath or os.curdir) as it:
+            entries = list(it)
+    except OSError:
+        return
+    hidden_ok = part.startswith(".")
+    for entry in entries:
+        name = entry.name
+        if (name.startswith(".") and not hidden_ok) or not match(name):
+            continue
+        # DirEntry.is_file()/is_dir() use the file type returned by the directory listing,
+        # so no extra stat is needed to tell regular files and directories apart
+        if not rest:
+            st = _entry_file_stat(entry)
+            if st is not None:
+                yield _join(dirpath, name), st
+        elif _entry_is_dir(entry):
+            yield from _walk_glob(_join(dirpath, name), rest)
+
+
+def _scandir_glob(pattern: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Expand a glob pattern (with recursive "**") into the matching files and their stat results.
+
+    Behaves like glob.glob(pattern, recursive=True) filtered by os.path.isfile, but walks
+    directories with os.scandir, so that file types come from the directory listing
+    and each matching file is stat'ed exactly once (the stat is reused for sorting).
+
+    Args:
+        pattern (str): Glob pattern.
+    Returns:
+        Iterator[Tuple[str, os.stat_result]]: Paths of matching files with their stat results.
+    """
+    if os.altsep:
+        pattern = pattern.replace(os.altsep, os.sep)
+    drive, rest = os.path.splitdrive(pattern)
+    parts = rest.split(os.sep)
+
+    # Walk from the literal directory prefix up to the first wildcard component
+    i = 0
+    while i < len(parts) and not _MAGIC_CHECK.search(parts[i]):
+        i += 1
+    if i == len(parts):
+        st = _path_file_stat(pattern)
+        if st is not None:
+            yield pattern, st
+        return
+    root = os.sep.join(parts[:i])
+    if not root and i > 0:
+        root = os.sep
+    # Each component is compiled once here, not per directory entry
+    yield from _walk_glob(drive + root, [_compile_part(part) for part in parts[i:]])
+
+
+def resolve_files(patterns: List[str]) -> Tuple[List[str], List[os.stat_result], Dict[str, str]]:
     """
     Expand a list of glob patterns and collect matching files.
 
     Args:
         patterns (List[str]): List of glob/wildcard patterns.
     Returns:
-        Tuple[List[str], Dict[str, str]]: List of absolute file paths and mapping of abs paths to original paths.
+        Tuple[List[str], List[os.stat_result], Dict[str, str]]: List of absolute file paths,
+        their stat results (parallel to the paths), and mapping of abs paths to original paths.
     """
-    import glob
-
-    files: List[str] = []
+    unique_files: List[str] = []
+    stats: List[os.stat_result] = []
+    seen = set()
     path_mapping: Dict[str, str] = {}  # Maps absolute paths to original paths for tilde expansion
 
+    # Resolved once rather than per matched file
+    cwd = os.getcwd()
+    escaped_cwd = glob.escape(cwd)  # cwd is prefixed to patterns, so its "[", "*" and "?" must stay literal
+    home_path = os.path.expanduser("~")
+    home_prefix = os.path.join(home_path, "")
+
     for pat in patterns:
         # Expand tilde in pattern
         expanded_pat = os.path.expanduser(pat)
-        matched_files = glob.glob(expanded_pat, recursive=True)
-
-        for f in matched_files:
-            if os.path.isfile(f):
-                abs_path = os.path.abspath(f)
-                files.append(abs_path)
-
-                # Keep track of the original path format (with ~ if applicable)
-                if "~" in pat and os.path.expanduser("~") in abs_path:
-                    home_path = os.path.expanduser("~")
-                    rel_path = os.path.relpath(abs_path, home_path)
-                    path_mapping[abs_path] = os.path.join("~", rel_path)
-                else:
-                    path_mapping[abs_path] = abs_path
-
-    # Remove duplicates while preserving order
-    unique_files = []
-    seen = set()
-    for f in files:
-        if f not in seen:
-            unique_files.append(f)
-            seen.add(f)
+        pat_has_tilde = "~" in pat
+
+        # Walk from an absolute pattern so that matches come out absolute; when the pattern
+        # is also normalized, so are the matches, and no per-file path fix-up is needed
+        abs_pat = expanded_pat if os.path.isabs(expanded_pat) else os.path.join(escaped_cwd, expanded_pat)
+        needs_normpath = os.path.normpath(abs_pat) != abs_pat
+
+        for f, st in _scandir_glob(abs_pat):
+            abs_path = os.path.normpath(f) if needs_normpath else f
+            # Remove duplicates while preserving order
+            if abs_path not in seen:
+                seen.add(abs_path)
+                unique_files.append(abs_path)
+                stats.append(st)
+
+            # Keep track of the original path format (with ~ if applicable)
+            if pat_has_tilde and abs_path.startswith(home_prefix):
+                rel_path = os.path.relpath(abs_path, home_path)
+                path_mapping[abs_path] = os.path.join("~", rel_path)
+            else:
+                path_mapping[abs_path] = abs_path
+
+    return unique_files, stats, path_mapping
+
+
+def _iter_by_mtime(mtimes: List[int], newest: bool, window: int) -> Iterator[int]:
+    """
+    Yield file indices in modification-time order, without sorting more than is consumed.
 
-    return unique_files, path_mapping
+    The first `window` indices come from a heap selection (O(n log k)); if the caller keeps
+    consuming, the window grows fourfold per round until it covers all files (a full sort).
+
+    Args:
+        mtimes (List[int]): Modification times of the files (st_mtime_ns).
+        newest (bool): Yield the newest files first if True, the oldest first otherwise.
+        window (int): Number of indices to select in the first round.
+    Returns:
+        Iterator[int]: Indices into mtimes.
+    """
+    n = len(mtimes)
+    select = heapq.nlargest if newest else heapq.nsmallest
+    key = mtimes.__getitem__
+    done = 0
+    window = max(window, 1)
+    while done < n:
+        if window >= n:
+            top = sorted(range(n), key=key, reverse=newest)
+        else:
+            # Equivalent to the first `window` items of the full sort (ties included)
+            top = select(window, range(n), key=key)
+        yield from top[done:]
+        done = len(top)
+        window *= 4
+
+
+# Upper limit on the number of kind checks kept in flight ahead of the file being examined
+PREFETCH_WINDOW = 64
+
+
+def _select_matching(
+    candidates: Iterator[int],
+    check: Callable[[int], bool],
+    needed: int,
+    quick_check: Callable[[int], Optional[bool]] = lambda i: None,
+) -> List[int]:
+    """
+    Return the first `needed` candidates (in the given order) that pass the check.
+
+    Candidates that quick_check decides on the spot never reach the pool; the others
+    are checked ahead on a thread pool so that their file I/O overlaps, while results
+    are still consumed strictly in candidate order. Only as many checks as matches
+    still needed are started at first; the read-ahead doubles with each rejected
+    candidate, up to PREFETCH_WINDOW.
+
+    Args:
+        candidates (Iterator[int]): File indices in selection order.
+        check (Callable[[int], bool]): Predicate on a file index.
+        needed (int): Number of matches wanted.
+        quick_check (Callable[[int], Optional[bool]]): Cheap predicate returning None when undecided.
+    Returns:
+        List[int]: Matching indices, at most `needed` of them.
+    """
+    from collections import deque
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    matched: List[int] = []
+    extra = 0  # Read-ahead beyond the matches still needed
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+
+        def start(i: int) -> Tuple[int, Union[bool, Future]]:
+            verdict = quick_check(i)
+            return i, (ex.submit(check, i) if verdict is None else verdict)
+
+        window: "deque[Tuple[int, Union[bool, Future]]]" = deque()
+        while len(matched) < needed:
+            in_flight = min(PREFETCH_WINDOW, needed - len(matched) + extra)
+            while len(window) < in_flight:
+                nxt = next(candidates, None)
+                if nxt is None:
+                    break
+                window.append(start(nxt))
+            if not window:
+                break
+            i, result = window.popleft()
+            if result if isinstance(result, bool) else result.result():
+                matched.append(i)
+            else:
+                extra = max(1, extra * 2)
+        for _, result in window:
+            if not isinstance(result, bool):
+                result.cancel()
+    return matched
 
 
 def parse_argv() -> Tuple[argparse.Namespace, argparse.ArgumentParser]:
@@ -108,46 +372,61 @@ def main() -> None:
     args, parser = parse_argv()
     script_name = os.path.basename(sys.argv[0])
 
-    # Set up logging function based on quiet mode
+    # Set up logging functions based on quiet mode
     if args.quiet:
         def log(s: str) -> None:
             pass
+
+        def log_lines(lines: List[str]) -> None:
+            pass
     else:
         def log(s: str) -> None:
             print(script_name + ": " + s, file=sys.stderr)
 
-    # Step 1: Expand glob patterns to file paths and create path mapping
-    all_files, path_mapping = resolve_files(args.file)
+        def log_lines(lines: List[str]) -> None:
+            # All lines in a single write
+            sys.stderr.write("".join(script_name + ": " + s + "\n" for s in lines))
+            sys.stderr.flush()
+
+    # Step 1: Expand glob patterns to file paths (stat'ed during the walk) and create path mapping
+    all_files, stats, path_mapping = resolve_files(args.file)
     if not all_files:
         if args.allow_empty_result:
             return
         log("No files found matching the given path or wildcard pattern(s).")
         sys.exit(1)
 
-    # Step 2: Sort files by modification time
-    all_files = sorted(
-        all_files,
-        key=lambda f: os.stat(f).st_mtime,
-        reverse=args.newest > 0,
-    )
+    # Step 2: Collect modification times.
+    # mtimes and sizes are kept in arrays parallel to all_files so that the kind filter can reuse them.
+    mtimes = [st.st_mtime_ns for st in stats]
+    sizes = [st.st_size for st in stats]
 
-    # Step 3: Apply kind filter if specified, and select files by slice/count
+    # Step 3: Apply kind filter if specified, and select files by slice/count.
+    # Files are visited in mtime order, which is only computed as far as needed.
     needed = abs(args.newest)
     selected: List[str] = []
     if args.kind:
         kind_checker = get_kind_checker(args.kind)
-
-        # Select files in desired order (newest or oldest)
-        count = 0
-        for f in all_files:
-            if kind_checker(f):
-                selected.append(f)
-                count += 1
-                if count >= needed:
-                    break
+        ext_prefilter = get_ext_prefilter(args.kind)
+
+        # Files with another kind's extension can never match: drop them before ordering
+        verdicts = [ext_prefilter(f) for f in all_files]
+        candidates = [i for i, v in enumerate(verdicts) if v is not False]
+        candidate_mtimes = [mtimes[i] for i in candidates]
+
+        # Select files in desired order (newest or oldest); some candidates may not match,
+        # so start from a wider window than needed
+        matched = _select_matching(
+            (candidates[j] for j in _iter_by_mtime(candidate_mtimes, args.newest > 0, needed * 4)),
+            lambda i: kind_checker(all_files[i], mtimes[i], sizes[i]),
+            needed,
+            # Extension verdicts are already known, so those files skip the pool
+            verdicts.__getitem__,
+        )
+        selected = [all_files[i] for i in matched]
     else:
-        # No kind: just slice the sorted list
-        selected = all_files[:needed]
+        # No kind: just take the top entries
+        selected = [all_files[i] for i in islice(_iter_by_mtime(mtimes, args.newest > 0, needed), needed)]
 
     if not selected:
         if args.allow_empty_result:
@@ -162,14 +441,14 @@ def main() -> None:
         if not args.allow_empty_result:
             log(f"Fewer files were found than requested: {len(selected)}")
 
-    # Step 4: Output selected file paths to stdout
-    for path in selected:
-        # Use the original path format for logging (with ~ if applicable)
-        display_path = path_mapping.get(path, path)
-        log(f"Selected: {display_path}")
+    # Step 4: Output selected file paths to stdout.
+    # Each stream gets one joined write instead of a write per file.
+    # Use the original path format for logging (with ~ if applicable)
+    log_lines([f"Selected: {path_mapping.get(path, path)}" for path in selected])
 
-        # Output the absolute path to stdout for programmatic use
-        print(path)
+    # Output the absolute paths to stdout for programmatic use
+    sys.stdout.write("".join(path + "\n" for path in selected))
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
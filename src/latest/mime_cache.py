@@ -0,0 +1,113 @@
+"""
+On-disk cache of detected MIME types, so that repeated runs over the same
+directory do not re-scan unchanged files with libmagic.
+
+Entries are keyed by absolute path and validated against the file's mtime and size.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+
+# Bump when the table layout changes; an old cache is then dropped and rebuilt
+SCHEMA_VERSION = 1
+
+
+def default_cache_path() -> str:
+    """
+    Return the location of the MIME cache database.
+
+    Returns:
+        str: Path under $XDG_CACHE_HOME (or ~/.cache if unset).
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "latest", "mime.sqlite")
+
+
+class MimeCache:
+    """
+    MIME type cache backed by a SQLite database.
+
+    Lookups hit the database directly; new entries are buffered and written
+    in a single transaction by flush(), which is registered to run at exit.
+    The cache may be used from several threads.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS mime")
+                self._conn.execute(
+                    "CREATE TABLE mime (abspath TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, mime TEXT)"
+                )
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._pending: List[Tuple[str, int, int, str]] = []
+        atexit.register(self.flush)
+
+    def get(self, abspath: str, mtime_ns: int, size: int) -> Optional[str]:
+        """
+        Look up the cached MIME type of a file.
+
+        Args:
+            abspath (str): Absolute file path.
+            mtime_ns (int): Current modification time of the file, in nanoseconds.
+            size (int): Current size of the file.
+        Returns:
+            Optional[str]: The cached MIME type, or None if missing or stale.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT mtime_ns, size, mime FROM mime WHERE abspath = ?", (abspath,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return None
+        return row[2]
+
+    def put(self, abspath: str, mtime_ns: int, size: int, mime: str) -> None:
+        """
+        Record the MIME type of a file (written out on flush()).
+
+        Args:
+            abspath (str): Absolute file path.
+            mtime_ns (int): Modification time (ns) the MIME type was detected at.
+            size (int): Size the MIME type was detected at.
+            mime (str): Detected MIME type.
+        """
+        with self._lock:
+            self._pending.append((abspath, mtime_ns, size, mime))
+
+    def flush(self) -> None:
+        """
+        Write buffered entries to the database in one transaction.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany("INSERT OR REPLACE INTO mime VALUES (?, ?, ?, ?)", self._pending)
+            except sqlite3.Error:
+                pass  # The cache is only an optimization
+            self._pending.clear()
+
+
+def open_mime_cache(db_path: Optional[str] = None) -> Optional[MimeCache]:
+    """
+    Open the MIME cache, or return None if it is not usable (e.g. read-only home).
+
+    Args:
+        db_path (Optional[str]): Database path; defaults to default_cache_path().
+    Returns:
+        Optional[MimeCache]: The cache, or None.
+    """
+    try:
+        return MimeCache(db_path or default_cache_path())
+    except (OSError, sqlite3.Error):
+        return None
@@ -0,0 +1,169 @@
+import sys
+import types
+
+import pytest
+
+from latest import file_types
+from latest.header_sniff import CFBF_SIG
+
+
+class FakeMagic:
+    # Stand-in for magic.Magic that records how it was asked
+    calls = []
+
+    def __init__(self, mime=False):
+        pass
+
+    def from_buffer(self, data):
+        FakeMagic.calls.append(("buffer", len(data)))
+        if data.startswith(b"CDF"):
+            return "application/CDFV2"
+        return "text/plain"
+
+    def from_file(self, path):
+        FakeMagic.calls.append(("file", path))
+        return "application/msword"
+
+
+@pytest.fixture
+def fake_magic(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setitem(sys.modules, "magic", types.SimpleNamespace(Magic=FakeMagic))
+    FakeMagic.calls = []
+    return FakeMagic
+
+
+def test_libmagic_reads_prefix(tmp_path, fake_magic):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"x" * (file_types.MAGIC_BUFFER_SIZE + 100))
+    detect_mime = file_types._libmagic_detector()
+    assert detect_mime(str(path), 1, 2) == "text/plain"
+    assert fake_magic.calls == [("buffer", file_types.MAGIC_BUFFER_SIZE)]
+
+
+def test_libmagic_reads_whole_cfbf(tmp_path, fake_magic):
+    path = tmp_path / "a.bin"
+    path.write_bytes(CFBF_SIG + b"\x00" * 1000)
+    detect_mime = file_types._libmagic_detector()
+    assert detect_mime(str(path), 1, 2) == "application/msword"
+    assert fake_magic.calls == [("file", str(path))]
+
+
+def test_libmagic_retries_cdfv2_with_whole_file(tmp_path, fake_magic):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"CDF" + b"\x00" * 1000)
+    detect_mime = file_types._libmagic_detector()
+    assert detect_mime(str(path), 1, 2) == "application/msword"
+    assert fake_magic.calls == [("buffer", 1003), ("file", str(path))]
+
+
+@pytest.fixture
+def recording_detector(monkeypatch):
+    detected = []
+
+    def detector(path, mtime_ns, size):
+        detected.append(path)
+        return "application/msword"
+
+    monkeypatch.setattr(file_types, "get_mime_detector", lambda kind: detector)
+    return detected
+
+
+@pytest.mark.parametrize(
+    "kind, path, verdict",
+    [
+        ("doc", "a.doc", True),
+        ("doc", "a.DOCX", True),
+        ("doc", "dir.x/a.odt", True),
+        ("doc", "a.xlsx", False),
+        ("doc", "a.tar.gz", False),
+        ("xls", "a.ods", True),
+        ("ppt", "a.doc", False),
+        ("zip", "a.tgz", True),
+        ("doc", "a.txt", None),
+        ("doc", "a", None),
+        ("doc", ".doc", None),
+        ("image", "a.doc", None),
+        (None, "a.doc", None),
+    ],
+)
+def test_ext_prefilter(kind, path, verdict):
+    assert file_types.get_ext_prefilter(kind)(path) is verdict
+
+
+def test_kind_checker_trusts_own_extension(tmp_path, recording_detector):
+    # Plain text named e.DOC still counts as a doc: the extension is conclusive
+    path = tmp_path / "e.DOC"
+    path.write_text("plain text\n")
+    assert file_types.get_kind_checker("doc")(str(path), 1, 11)
+    assert recording_detector == []
+
+
+def test_kind_checker_rejects_other_kind_extension(tmp_path, recording_detector):
+    path = tmp_path / "x.xlsx"
+    path.write_text("plain text\n")
+    assert not file_types.get_kind_checker("doc")(str(path), 1, 11)
+    assert recording_detector == []
+
+
+def test_kind_checker_detects_unknown_extension(tmp_path, recording_detector):
+    path = tmp_path / "report.bin"
+    path.write_text("plain text\n")
+    assert file_types.get_kind_checker("DOC")(str(path), 1, 11)
+    assert recording_detector == [str(path)]
+
+
+def test_kind_checker_major_type(monkeypatch):
+    monkeypatch.setattr(file_types, "get_mime_detector", lambda kind: lambda path, mtime_ns, size: "image/png")
+    assert file_types.get_kind_checker("image")("a.doc", 1, 1)
+    assert not file_types.get_kind_checker("text")("a.png", 1, 1)
+
+
+def test_kind_checker_without_kind():
+    assert file_types.get_kind_checker(None)("missing", 1, 1)
+
+
+@pytest.fixture
+def libmagic_sentinel(monkeypatch):
+    def sentinel(path, mtime_ns, size):
+        return "sentinel"
+
+    monkeypatch.setattr(file_types, "_libmagic_detector", lambda: sentinel)
+    return sentinel
+
+
+@pytest.mark.parametrize("backend", [None, "magic", "MAGIC", "unknown"])
+def test_backend_default_is_libmagic(monkeypatch, libmagic_sentinel, backend):
+    if backend is None:
+        monkeypatch.delenv(file_types.MIME_BACKEND_ENV, raising=False)
+    else:
+        monkeypatch.setenv(file_types.MIME_BACKEND_ENV, backend)
+    assert file_types.get_mime_detector("doc") is libmagic_sentinel
+
+
+def test_backend_header(tmp_path, monkeypatch, libmagic_sentinel):
+    monkeypatch.setenv(file_types.MIME_BACKEND_ENV, "header")
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"\x1f\x8b" + b"\x00" * 20)
+    detect_mime = file_types.get_mime_detector("zip")
+    assert detect_mime is not libmagic_sentinel
+    assert detect_mime(str(path), 1, 22) == "application/gzip"
+
+
+def test_backend_header_unknown_kind_falls_back(monkeypatch, libmagic_sentinel):
+    monkeypatch.setenv(file_types.MIME_BACKEND_ENV, "header")
+    assert file_types.get_mime_detector("image") is libmagic_sentinel
+
+
+def test_backend_puremagic(tmp_path, monkeypatch, libmagic_sentinel):
+    monkeypatch.setenv(file_types.MIME_BACKEND_ENV, "puremagic")
+    fake = types.SimpleNamespace(PureError=Exception, from_file=lambda path, mime=False: "image/png")
+    monkeypatch.setitem(sys.modules, "puremagic", fake)
+    detect_mime = file_types.get_mime_detector("image")
+    assert detect_mime("a.png", 1, 1) == "image/png"
+
+
+def test_backend_puremagic_missing_falls_back(monkeypatch, libmagic_sentinel):
+    monkeypatch.setenv(file_types.MIME_BACKEND_ENV, "puremagic")
+    monkeypatch.setitem(sys.modules, "puremagic", None)  # Makes the import fail
+    assert file_types.get_mime_detector("doc") is libmagic_sentinel
@@ -0,0 +1,109 @@
+import bz2
+import gzip
+import lzma
+import struct
+import tarfile
+import zipfile
+
+import pytest
+
+from latest.header_sniff import CFBF_MIME, CFBF_SIG, sniff_mime
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PPTX = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+ODT = "application/vnd.oasis.opendocument.text"
+
+
+def write_ooxml(path, main_part):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", "<Types/>" * 500)
+        z.writestr("_rels/.rels", "<Relationships/>")
+        z.writestr(main_part, "x" * 5000)
+
+
+def write_cfbf(path, sector_shift, dir_sector, stream_name):
+    head = bytearray(512)
+    head[:8] = CFBF_SIG
+    struct.pack_into("<H", head, 0x1E, sector_shift)
+    struct.pack_into("<I", head, 0x30, dir_sector)
+    # Sector 0 (unused) followed by directory sector 1, whose second entry names the stream
+    sectors = bytearray(1024)
+    name = stream_name.encode("utf-16-le")
+    sectors[512 + 128 : 512 + 128 + len(name)] = name
+    path.write_bytes(bytes(head) + bytes(sectors))
+
+
+@pytest.mark.parametrize(
+    "main_part, mime",
+    [("word/document.xml", DOCX), ("xl/workbook.xml", XLSX), ("ppt/presentation.xml", PPTX)],
+)
+def test_ooxml(tmp_path, main_part, mime):
+    path = tmp_path / "file.bin"
+    write_ooxml(path, main_part)
+    assert sniff_mime(str(path)) == mime
+
+
+def test_odf(tmp_path):
+    path = tmp_path / "file.bin"
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr(zipfile.ZipInfo("mimetype"), ODT)  # stored, as ODF requires
+        z.writestr("content.xml", "<office:document-content/>")
+    assert sniff_mime(str(path)) == ODT
+
+
+def test_plain_zip(tmp_path):
+    path = tmp_path / "file.bin"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("a.txt", "hello")
+    assert sniff_mime(str(path)) == "application/zip"
+
+
+def test_tar(tmp_path):
+    member = tmp_path / "member.txt"
+    member.write_text("hello")
+    path = tmp_path / "file.bin"
+    with tarfile.open(path, "w") as t:
+        t.add(member, arcname="member.txt")
+    assert sniff_mime(str(path)) == "application/x-tar"
+
+
+@pytest.mark.parametrize(
+    "compress, mime",
+    [
+        (gzip.compress, "application/gzip"),
+        (bz2.compress, "application/x-bzip2"),
+        (lzma.compress, "application/x-xz"),
+        (lambda data: lzma.compress(data, format=lzma.FORMAT_ALONE), "application/x-lzma"),
+    ],
+)
+def test_compressed(tmp_path, compress, mime):
+    path = tmp_path / "file.bin"
+    path.write_bytes(compress(b"hello" * 100))
+    assert sniff_mime(str(path)) == mime
+
+
+@pytest.mark.parametrize("data", [b"", b"\x1f", b"\x5d\x00", b"plain text\n"])
+def test_unrecognized(tmp_path, data):
+    path = tmp_path / "file.bin"
+    path.write_bytes(data)
+    assert sniff_mime(str(path)) is None
+
+
+def test_legacy_office(tmp_path):
+    path = tmp_path / "file.bin"
+    write_cfbf(path, 9, 1, "WordDocument")
+    assert sniff_mime(str(path)) == "application/msword"
+
+
+@pytest.mark.parametrize("sector_shift, dir_sector", [(0xFFFF, 1), (0, 1), (9, 0xFFFFFFFF)])
+def test_corrupt_cfbf(tmp_path, sector_shift, dir_sector):
+    path = tmp_path / "file.bin"
+    write_cfbf(path, sector_shift, dir_sector, "WordDocument")
+    assert sniff_mime(str(path)) == CFBF_MIME
+
+
+def test_truncated_cfbf(tmp_path):
+    path = tmp_path / "file.bin"
+    path.write_bytes(CFBF_SIG + b"\x00" * 8)
+    assert sniff_mime(str(path)) == CFBF_MIME
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import sys
+import types
+
+import pytest
+
+from latest import file_types
+from latest.mime_cache import MimeCache, default_cache_path, open_mime_cache
+
+
+def count_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM mime").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_get_after_flush(tmp_path):
+    db = str(tmp_path / "mime.sqlite")
+    cache = MimeCache(db)
+    cache.put("/x/a.doc", 100, 10, "application/msword")
+    cache.flush()
+    assert MimeCache(db).get("/x/a.doc", 100, 10) == "application/msword"
+
+
+@pytest.mark.parametrize("mtime_ns, size", [(101, 10), (100, 11), (99, 9)])
+def test_stale_entry_is_a_miss(tmp_path, mtime_ns, size):
+    cache = MimeCache(str(tmp_path / "mime.sqlite"))
+    cache.put("/x/a.doc", 100, 10, "application/msword")
+    cache.flush()
+    assert cache.get("/x/a.doc", mtime_ns, size) is None
+    assert cache.get("/x/other.doc", 100, 10) is None
+
+
+def test_put_is_buffered_until_flush(tmp_path):
+    db = str(tmp_path / "mime.sqlite")
+    cache = MimeCache(db)
+    cache.put("/x/a.doc", 100, 10, "application/msword")
+    cache.put("/x/b.doc", 100, 10, "application/msword")
+    assert count_rows(db) == 0
+    assert MimeCache(db).get("/x/a.doc", 100, 10) is None
+    cache.flush()
+    assert count_rows(db) == 2
+
+
+def test_corrupt_db(tmp_path):
+    db = tmp_path / "mime.sqlite"
+    db.write_bytes(b"this is not a sqlite database" * 100)
+    assert open_mime_cache(str(db)) is None
+
+
+def test_unwritable_location(tmp_path):
+    # The cache directory cannot be created under a regular file
+    (tmp_path / "file").write_text("")
+    assert open_mime_cache(str(tmp_path / "file" / "latest" / "mime.sqlite")) is None
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() == 0, reason="root ignores file permissions")
+def test_read_only_db(tmp_path):
+    db = tmp_path / "mime.sqlite"
+    sqlite3.connect(str(db)).close()  # An empty database of another schema version
+    db.chmod(0o444)
+    assert open_mime_cache(str(db)) is None
+
+
+def test_default_cache_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_path() == os.path.join(str(tmp_path), "latest", "mime.sqlite")
+
+
+class FakeMagic:
+    def __init__(self, mime=False):
+        pass
+
+    def from_buffer(self, data):
+        return "text/plain"
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv(file_types.MIME_BACKEND_ENV, raising=False)
+    monkeypatch.setitem(sys.modules, "magic", types.SimpleNamespace(Magic=FakeMagic))
+    return tmp_path / "cache"
+
+
+def test_extension_only_run_creates_no_cache(tmp_path, cache_home):
+    checker = file_types.get_kind_checker("doc")
+    for name in ["a.docx", "b.DOC", "c.xlsx", "d.zip"]:
+        (tmp_path / name).write_text("text")
+        checker(str(tmp_path / name), 1, 4)
+    assert not os.path.exists(default_cache_path())
+
+
+def test_detection_creates_cache(tmp_path, cache_home):
+    checker = file_types.get_kind_checker("doc")
+    (tmp_path / "a.txt").write_text("text")
+    assert not checker(str(tmp_path / "a.txt"), 1, 4)
+    assert os.path.exists(default_cache_path())
@@ -0,0 +1,123 @@
+import glob
+import ntpath
+import os
+
+import pytest
+
+from latest.latest import resolve_files
+
+
+def glob_files(pattern):
+    # Reference result: what the glob module matches, as resolve_files reports it
+    files = []
+    for f in glob.glob(os.path.expanduser(pattern), recursive=True):
+        abs_path = os.path.abspath(f)
+        if os.path.isfile(f) and abs_path not in files:
+            files.append(abs_path)
+    return sorted(files)
+
+
+@pytest.fixture(scope="module")
+def tree(tmp_path_factory):
+    root = tmp_path_factory.mktemp("tree")
+    for rel in [
+        "r.txt",
+        ".dot.txt",
+        "a/x.py",
+        "a/.hf.py",
+        "a/b/y.py",
+        "a/b/c/z.py",
+        "a/b/[k].txt",
+        "a/.hid/w.py",
+        ".h/x/q.py",
+        "loop/d/f.txt",
+    ]:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+    (root / "lnk").symlink_to("a", target_is_directory=True)
+    (root / "loop" / "d" / "up").symlink_to("..", target_is_directory=True)
+    return root
+
+
+PATTERNS = [
+    "*",
+    "**",
+    "**/*.py",
+    "**/*.txt",
+    "a/**/*.py",
+    "a/*/*.py",
+    "*/b/*.py",
+    "a/**",
+    "a/**/b/**/*.py",
+    "a/**b/*",
+    ".*",
+    "a/.*",
+    "**/.*",
+    "r.txt",
+    "nope",
+    "nope/*",
+    "a/b/[[]k].txt",
+    "a/b/[!y]*",
+    "a/b/?.py",
+    "a/b/*[",
+    "a/",
+    "*/",
+    "../*/r.txt",
+    "a/../*.txt",
+    "./*.txt",
+    "a//x.py",
+    "a//*.py",
+    "lnk/**",
+    "lnk/*.py",
+    "loop/**",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_relative_pattern_matches_glob(tree, monkeypatch, pattern):
+    monkeypatch.chdir(tree)
+    assert sorted(resolve_files([pattern])[0]) == glob_files(pattern)
+
+
+@pytest.mark.parametrize("pattern", ["**/*.py", "*", "a/*/*.py", "a/../*.txt"])
+def test_absolute_pattern_matches_glob(tree, pattern):
+    pattern = os.path.join(glob.escape(str(tree)), pattern)
+    assert sorted(resolve_files([pattern])[0]) == glob_files(pattern)
+
+
+def test_duplicates_removed(tree, monkeypatch):
+    monkeypatch.chdir(tree)
+    files, stats, _ = resolve_files(["*.txt", "r.txt", "**/*.txt"])
+    assert len(files) == len(set(files))
+    assert len(stats) == len(files)
+
+
+def test_stats_belong_to_files(tree, monkeypatch):
+    monkeypatch.chdir(tree)
+    files, stats, _ = resolve_files(["**"])
+    assert files
+    for f, st in zip(files, stats):
+        assert st.st_mtime_ns == os.stat(f).st_mtime_ns
+        assert st.st_size == os.stat(f).st_size
+
+
+def test_cwd_with_wildcard_characters(tmp_path, monkeypatch):
+    # The cwd must not be read as a pattern: "proj[1]" would otherwise match "proj1"
+    (tmp_path / "proj1").mkdir()
+    (tmp_path / "proj1" / "zzz.txt").write_text("other")
+    cwd = tmp_path / "proj[1]"
+    cwd.mkdir()
+    (cwd / "a.txt").write_text("here")
+    monkeypatch.chdir(cwd)
+    assert resolve_files(["*.txt"])[0] == [str(cwd / "a.txt")] == glob_files("*.txt")
+
+
+@pytest.mark.parametrize("pattern", ["*.DOCX", "[XY].docx", "?.Docx"])
+def test_windows_matches_case_insensitively(tmp_path, monkeypatch, pattern):
+    for name in ["x.docx", "Y.DOCX", "z.txt"]:
+        (tmp_path / name).write_text(name)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(os, "name", "nt")
+    monkeypatch.setattr(os.path, "normcase", ntpath.normcase)
+    assert sorted(resolve_files([pattern])[0]) == [str(tmp_path / "Y.DOCX"), str(tmp_path / "x.docx")]
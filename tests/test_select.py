@@ -0,0 +1,116 @@
+import heapq
+import threading
+
+import pytest
+
+from latest.latest import PREFETCH_WINDOW, _iter_by_mtime, _select_matching
+
+
+class CountingCheck:
+    def __init__(self, predicate):
+        self.predicate = predicate
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, i):
+        with self.lock:
+            self.calls.append(i)
+        return self.predicate(i)
+
+
+def test_select_needed_one_runs_one_check():
+    check = CountingCheck(lambda i: True)
+    assert _select_matching(iter(range(1000)), check, 1) == [0]
+    assert check.calls == [0]
+
+
+def test_select_needed_n_runs_n_checks_when_all_match():
+    check = CountingCheck(lambda i: True)
+    assert _select_matching(iter(range(1000)), check, 5) == [0, 1, 2, 3, 4]
+    assert sorted(check.calls) == [0, 1, 2, 3, 4]
+
+
+def test_select_read_ahead_grows_with_rejections():
+    # Only every 10th candidate matches: the read-ahead has to grow, but stays bounded
+    check = CountingCheck(lambda i: i % 10 == 9)
+    assert _select_matching(iter(range(1000)), check, 3) == [9, 19, 29]
+    assert len(check.calls) <= 29 + PREFETCH_WINDOW
+
+
+def test_select_keeps_candidate_order():
+    check = CountingCheck(lambda i: i % 3 == 0)
+    candidates = [7, 3, 9, 1, 6, 12, 5, 0]
+    assert _select_matching(iter(candidates), check, 3) == [3, 9, 6]
+
+
+def test_select_quick_check_skips_check():
+    check = CountingCheck(lambda i: True)
+    verdicts = {0: False, 1: True, 2: None, 3: True}
+    assert _select_matching(iter(range(4)), check, 3, verdicts.__getitem__) == [1, 2, 3]
+    assert check.calls == [2]
+
+
+def test_select_fewer_matches_than_needed():
+    check = CountingCheck(lambda i: i in (2, 5))
+    assert _select_matching(iter(range(8)), check, 4) == [2, 5]
+    assert sorted(check.calls) == list(range(8))
+
+
+def test_select_needed_one_uses_first_heap_window_only(monkeypatch):
+    windows = []
+    nlargest = heapq.nlargest
+
+    def recording_nlargest(n, iterable, key=None):
+        windows.append(n)
+        return nlargest(n, iterable, key=key)
+
+    monkeypatch.setattr(heapq, "nlargest", recording_nlargest)
+    mtimes = list(range(1000))
+    check = CountingCheck(lambda i: True)
+    assert _select_matching(_iter_by_mtime(mtimes, True, 4), check, 1) == [999]
+    assert windows == [4]
+
+
+@pytest.mark.parametrize("newest", [True, False])
+@pytest.mark.parametrize("window", [1, 3, 10, 100])
+@pytest.mark.parametrize(
+    "mtimes",
+    [
+        [],
+        [5],
+        [3, 1, 2],
+        [1, 1, 1, 1, 1],
+        [4, 2, 4, 1, 2, 4, 3, 1, 2, 4, 0, 3, 3, 2, 1, 0, 4, 2, 2, 1],
+        [(i * 7919) % 31 for i in range(200)],
+    ],
+)
+def test_iter_by_mtime_matches_sorted(mtimes, window, newest):
+    expected = sorted(range(len(mtimes)), key=mtimes.__getitem__, reverse=newest)
+    assert list(_iter_by_mtime(mtimes, newest, window)) == expected
+
+
+@pytest.mark.parametrize("newest, select", [(True, "nlargest"), (False, "nsmallest")])
+def test_iter_by_mtime_window_growth(monkeypatch, newest, select):
+    windows = []
+    original = getattr(heapq, select)
+
+    def recording(n, iterable, key=None):
+        windows.append(n)
+        return original(n, iterable, key=key)
+
+    monkeypatch.setattr(heapq, select, recording)
+    mtimes = [(i * 37) % 101 for i in range(100)]
+    it = _iter_by_mtime(mtimes, newest, 2)
+
+    # Consuming within the first window selects once
+    first = [next(it), next(it)]
+    assert windows == [2]
+
+    # Going past it grows the window fourfold per round, without repeating indices
+    rest = [next(it) for _ in range(30)]
+    assert windows == [2, 8, 32]
+
+    # Past the last heap window that is smaller than the list, a full sort takes over
+    rest += list(it)
+    assert windows == [2, 8, 32]
+    assert first + rest == sorted(range(100), key=mtimes.__getitem__, reverse=newest)